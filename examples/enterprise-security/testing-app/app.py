@@ -2,21 +2,27 @@
 Redis Testing Application
 Flask-based web app for testing Azure Managed Redis connectivity
 """
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, g
 from functools import wraps
 import logging
+import time
 from datetime import datetime
 
 from config import Config
-from utils import setup_logging, redis_client
-from tests import redis_test_suite
+from utils import setup_logging, redis_client, route_sampler, get_logging_stats, target_registry
+from utils.logger import reset_redis_timing, get_redis_timing
+from tests import (redis_test_suite, multi_target_benchmark, data_structure_suite,
+                   messaging_benchmark, scripting_benchmark, distributed_coordinator,
+                   DistributedWorker, keyspace_analyzer)
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
 
 # Setup logging
-logger = setup_logging()
+setup_logging()
+logger = logging.getLogger('redis_test_app')
+access_logger = logging.getLogger('redis_test_app.access')
 logger.info("Starting Redis Testing Application")
 
 # Application Insights integration (if configured)
@@ -36,6 +42,39 @@ if Config.APPLICATIONINSIGHTS_CONNECTION_STRING:
         logger.error(f"Failed to initialize Application Insights: {e}")
 
 
+# Distributed load worker (joins runs published on the coordinator key space)
+if Config.DISTRIBUTED_WORKER:
+    distributed_worker = DistributedWorker()
+    distributed_worker.start_background()
+
+
+# Request timing and sampled access logging
+@app.before_request
+def start_request_timer():
+    """Record request start time and reset Redis time accumulator"""
+    g.request_start = time.perf_counter()
+    reset_redis_timing()
+
+
+@app.after_request
+def log_request(response):
+    """Emit one sampled, structured access log line per request"""
+    # Unmatched paths share one bucket so per-route limiters stay bounded
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    if route_sampler.should_log(route, response.status_code):
+        duration_ms = (time.perf_counter() - g.get('request_start', time.perf_counter())) * 1000
+        redis_ms, redis_calls = get_redis_timing()
+        access_logger.info("request completed", extra={
+            "route": route,
+            "method": request.method,
+            "status_code": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "redis_ms": round(redis_ms, 2),
+            "redis_calls": redis_calls
+        })
+    return response
+
+
 # API Key authentication decorator
 def require_api_key(f):
     """Decorator to require API key for endpoints"""
@@ -77,7 +116,7 @@ def health_check():
 @require_api_key
 def redis_status():
     """Get Redis connection status"""
-    logger.info("Checking Redis status")
+    logger.debug("Checking Redis status")
     
     is_connected = redis_client.is_connected()
     
@@ -94,7 +133,7 @@ def redis_status():
 @require_api_key
 def run_full_test():
     """Run full Redis test suite"""
-    logger.info("Running full Redis test suite")
+    logger.debug("Running full Redis test suite")
     
     try:
         results = redis_test_suite.run_full_test_suite()
@@ -112,7 +151,7 @@ def run_full_test():
 @require_api_key
 def run_simple_test():
     """Run simple ping test"""
-    logger.info("Running simple ping test")
+    logger.debug("Running simple ping test")
     
     try:
         result = redis_test_suite.test_connection()
@@ -134,7 +173,7 @@ def run_simple_test():
 @require_api_key
 def run_write_test():
     """Run write operation test"""
-    logger.info("Running write test")
+    logger.debug("Running write test")
     
     try:
         data = request.get_json() or {}
@@ -160,7 +199,7 @@ def run_write_test():
 @require_api_key
 def run_read_test():
     """Run read operation test"""
-    logger.info("Running read test")
+    logger.debug("Running read test")
     
     try:
         data = request.get_json() or {}
@@ -185,7 +224,7 @@ def run_read_test():
 @require_api_key
 def run_performance_test():
     """Run performance test"""
-    logger.info("Running performance test")
+    logger.debug("Running performance test")
     
     try:
         data = request.get_json() or {}
@@ -206,11 +245,247 @@ def run_performance_test():
         }), 500
 
 
+@app.route('/api/redis/test/logging', methods=['POST'])
+@require_api_key
+def run_logging_overhead_test():
+    """Measure per-request logging overhead"""
+    logger.debug("Running logging overhead test")
+    
+    try:
+        data = request.get_json() or {}
+        iterations = data.get('iterations', 1000)
+        
+        result = redis_test_suite.test_logging_overhead(iterations)
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "test": "logging",
+            "result": result,
+            "pipeline": get_logging_stats()
+        })
+    except Exception as e:
+        logger.error(f"Logging overhead test failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/targets', methods=['GET'])
+@require_api_key
+def list_targets():
+    """List registered benchmark targets"""
+    return jsonify({
+        "timestamp": datetime.utcnow().isoformat(),
+        "targets": target_registry.to_list()
+    })
+
+
+@app.route('/api/redis/benchmark/targets', methods=['POST'])
+@require_api_key
+def run_multi_target_benchmark():
+    """Run one workload against several targets and compare them"""
+    logger.debug("Running multi-target benchmark")
+    
+    try:
+        data = request.get_json() or {}
+        result = multi_target_benchmark.run(
+            workload_name=data.get('workload', 'string'),
+            workload_params=data.get('params', {}),
+            operations=data.get('operations', 1000),
+            threads=data.get('threads', 1),
+            mode=data.get('mode', 'concurrent'),
+            target_names=data.get('targets')
+        )
+        return jsonify(result)
+    except (ValueError, KeyError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Multi-target benchmark failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/redis/benchmark/structures', methods=['POST'])
+@require_api_key
+def run_data_structure_benchmark():
+    """Run a hash, zset, list or stream workload, optionally across collection sizes"""
+    logger.debug("Running data-structure benchmark")
+    
+    try:
+        data = request.get_json() or {}
+        workload = data.get('workload', 'hash')
+        params = data.get('params', {})
+        operations = data.get('operations', 1000)
+        threads = data.get('threads', 1)
+        sizes = data.get('sizes')
+        
+        if sizes:
+            result = data_structure_suite.run_size_sweep(workload, sizes, params, operations, threads)
+        else:
+            result = data_structure_suite.run_workload(workload, params, operations, threads)
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "test": "structures",
+            "result": result
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Data-structure benchmark failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/redis/benchmark/messaging', methods=['POST'])
+@require_api_key
+def run_messaging_benchmark():
+    """Run a Pub/Sub, sharded Pub/Sub or Streams delivery latency benchmark"""
+    logger.debug("Running messaging benchmark")
+    
+    try:
+        data = request.get_json() or {}
+        result = messaging_benchmark.run(
+            mode=data.get('mode', 'pubsub'),
+            channels=data.get('channels', 1),
+            subscribers=data.get('subscribers', 1),
+            message_size=data.get('message_size', 128),
+            messages=data.get('messages', 1000),
+            publish_rate=data.get('publish_rate', 0),
+            consumer_delay_ms=data.get('consumer_delay_ms', 0),
+            stream_maxlen=data.get('stream_maxlen'),
+            batch=data.get('batch', 100)
+        )
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "test": "messaging",
+            "result": result
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Messaging benchmark failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/redis/benchmark/scripting', methods=['POST'])
+@require_api_key
+def run_scripting_benchmark():
+    """Compare round trips, pipelines, MULTI/EXEC, EVALSHA and FCALL for one operation"""
+    logger.debug("Running scripting benchmark")
+    
+    try:
+        data = request.get_json() or {}
+        result = scripting_benchmark.run(
+            approaches=data.get('approaches'),
+            operations=data.get('operations', 1000),
+            threads=data.get('threads', 1),
+            keys=data.get('keys', 100),
+            ttl=data.get('ttl', 60)
+        )
+        return jsonify(result)
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Scripting benchmark failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/distributed/runs', methods=['POST'])
+@require_api_key
+def start_distributed_run():
+    """Start a distributed run; workers enroll and the report is fetched by run id"""
+    logger.debug("Starting distributed run")
+    
+    try:
+        data = request.get_json() or {}
+        run_id = distributed_coordinator.run_in_background(
+            workload=data.get('workload', 'string'),
+            params=data.get('params', {}),
+            operations_per_worker=data.get('operations_per_worker', 1000),
+            threads=data.get('threads', 1),
+            expected_workers=data.get('expected_workers', 1),
+            target=data.get('target'),
+            enroll_timeout=data.get('enroll_timeout', 30),
+            start_delay=data.get('start_delay', 2.0),
+            barrier_timeout=data.get('barrier_timeout')
+        )
+        return jsonify({
+            "status": "enrolling",
+            "run_id": run_id,
+            "timestamp": datetime.utcnow().isoformat()
+        }), 202
+    except (ValueError, KeyError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Failed to start distributed run: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
+@app.route('/api/distributed/runs/<run_id>', methods=['GET'])
+@require_api_key
+def get_distributed_run(run_id):
+    """Get the aggregated report of a distributed run"""
+    try:
+        return jsonify(distributed_coordinator.report(run_id))
+    except KeyError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 404
+    except Exception as e:
+        logger.error(f"Failed to get distributed run {run_id}: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
 @app.route('/api/redis/info', methods=['GET'])
 @require_api_key
 def get_redis_info():
     """Get Redis server information"""
-    logger.info("Getting Redis info")
+    logger.debug("Getting Redis info")
     
     try:
         result = redis_test_suite.get_redis_info()
@@ -227,11 +502,44 @@ def get_redis_info():
         }), 500
 
 
+@app.route('/api/redis/keyspace', methods=['POST'])
+@require_api_key
+def analyze_keyspace():
+    """Analyze memory footprint by key prefix and encoding"""
+    logger.debug("Analyzing key space")
+    
+    try:
+        data = request.get_json() or {}
+        result = keyspace_analyzer.analyze(
+            match=data.get('match', '*'),
+            delimiter=data.get('delimiter', ':'),
+            prefix_depth=data.get('prefix_depth', 1),
+            max_keys=data.get('max_keys', 100000),
+            sample_rate=data.get('sample_rate'),
+            time_budget_seconds=data.get('time_budget_seconds', 60),
+            top=data.get('top', 25)
+        )
+        return jsonify(result)
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 400
+    except Exception as e:
+        logger.error(f"Key-space analysis failed: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 500
+
+
 # Public endpoint for web UI (no API key required)
 @app.route('/api/ui/test', methods=['POST'])
 def run_ui_test():
     """Run test from web UI (no API key required)"""
-    logger.info("Running test from web UI")
+    logger.debug("Running test from web UI")
     
     try:
         data = request.get_json() or {}
@@ -19,6 +19,17 @@ class Config:
     REDIS_SSL = os.environ.get('REDIS_SSL', 'true').lower() == 'true'
     REDIS_CLUSTER_NAME = os.environ.get('REDIS_CLUSTER_NAME', 'redis-cluster')
     REDIS_USE_ENTRA_ID = os.environ.get('REDIS_USE_ENTRA_ID', 'true').lower() == 'true'
+    REDIS_SKU = os.environ.get('REDIS_SKU', '')
+    REDIS_HOURLY_COST_USD = float(os.environ.get('REDIS_HOURLY_COST_USD', 0))
+    
+    # Benchmark targets: JSON list of named endpoints (inline or from a file)
+    REDIS_TARGETS = os.environ.get('REDIS_TARGETS', '')
+    REDIS_TARGETS_FILE = os.environ.get('REDIS_TARGETS_FILE', '')
+    
+    # Distributed load: coordinator key space (empty = use the target Redis as a stand-in)
+    COORDINATOR_REDIS_URL = os.environ.get('COORDINATOR_REDIS_URL', '')
+    DISTRIBUTED_WORKER = os.environ.get('DISTRIBUTED_WORKER', 'false').lower() == 'true'
+    DISTRIBUTED_POLL_INTERVAL = float(os.environ.get('DISTRIBUTED_POLL_INTERVAL', 2))
     
     # API Configuration
     API_KEY = os.environ.get('API_KEY', 'dev-api-key')
@@ -30,6 +41,12 @@ class Config:
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'true').lower() == 'true'
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    # Comma-separated route=rate pairs, e.g. "/api/ui/status=0.1,/api/redis/status=0.1"
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '/api/ui/status=0.1,/api/health=0.1')
+    LOG_DEFAULT_SAMPLE_RATE = float(os.environ.get('LOG_DEFAULT_SAMPLE_RATE', 1.0))
+    LOG_RATE_LIMIT_PER_SEC = float(os.environ.get('LOG_RATE_LIMIT_PER_SEC', 50))
     
     @staticmethod
     def get_redis_config():
@@ -2,5 +2,15 @@
 Test modules
 """
 from .redis_tests import redis_test_suite, RedisTestSuite
+from .multi_target import multi_target_benchmark, MultiTargetBenchmark
+from .data_structures import data_structure_suite, DataStructureSuite
+from .messaging import messaging_benchmark, MessagingBenchmark
+from .scripting import scripting_benchmark, ScriptingBenchmark
+from .distributed import distributed_coordinator, DistributedCoordinator, DistributedWorker
+from .keyspace import keyspace_analyzer, KeyspaceAnalyzer
 
-__all__ = ['redis_test_suite', 'RedisTestSuite']
+__all__ = ['redis_test_suite', 'RedisTestSuite', 'multi_target_benchmark', 'MultiTargetBenchmark',
+           'data_structure_suite', 'DataStructureSuite', 'messaging_benchmark', 'MessagingBenchmark',
+           'scripting_benchmark', 'ScriptingBenchmark',
+           'distributed_coordinator', 'DistributedCoordinator', 'DistributedWorker',
+           'keyspace_analyzer', 'KeyspaceAnalyzer']
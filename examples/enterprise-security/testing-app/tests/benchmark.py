@@ -0,0 +1,220 @@
+"""
+Benchmark Engine
+Runs a workload against a Redis client and reports throughput and latency percentiles
+"""
+import random
+import threading
+import time
+import uuid
+import logging
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Keys measured with MEMORY USAGE when reporting memory per element
+MEMORY_SAMPLE_KEYS = 10
+
+
+def memory_per_element(client, keys, elements_per_key):
+    """Measure server memory for a sample of keys and divide by the element count"""
+    sample = keys[:MEMORY_SAMPLE_KEYS]
+    if not sample or elements_per_key <= 0:
+        return None
+    pipe = client.pipeline(transaction=False)
+    for key in sample:
+        # SAMPLES 0 walks every element so the figure is exact for the sampled keys
+        pipe.memory_usage(key, samples=0)
+    usages = [usage or 0 for usage in pipe.execute()]
+    avg_bytes = sum(usages) / len(usages)
+    return {
+        "keys_sampled": len(sample),
+        "elements_per_key": elements_per_key,
+        "avg_bytes_per_key": round(avg_bytes, 1),
+        "bytes_per_element": round(avg_bytes / elements_per_key, 2)
+    }
+
+
+class Workload:
+    """Base class for benchmark workloads"""
+
+    name = "base"
+
+    def __init__(self, key_prefix=None):
+        # Random component so concurrent runs against one endpoint never share keys
+        self.key_prefix = key_prefix or f"bench:{self.name}:{uuid.uuid4().hex[:8]}"
+
+    def setup(self, client):
+        """Prepare data before timing starts"""
+
+    def run_op(self, client, i):
+        """Run one logical operation; this is what gets timed"""
+        raise NotImplementedError
+
+    def teardown(self, client):
+        """Remove data created by the workload"""
+
+    def memory_report(self, client):
+        """Get server memory per element after setup, or None if not applicable"""
+        return None
+
+    def describe(self):
+        """Get the workload parameters for reports"""
+        return {"name": self.name}
+
+
+class StringWorkload(Workload):
+    """Mixed GET/SET workload over a fixed key space"""
+
+    name = "string"
+
+    def __init__(self, key_space=1000, value_size=100, read_ratio=0.8, key_prefix=None):
+        super().__init__(key_prefix)
+        self.key_space = key_space
+        self.value_size = value_size
+        self.read_ratio = read_ratio
+        self.value = "x" * value_size
+
+    def _key(self, i):
+        return f"{self.key_prefix}:{i % self.key_space}"
+
+    def setup(self, client):
+        pipe = client.pipeline(transaction=False)
+        for i in range(self.key_space):
+            pipe.set(self._key(i), self.value)
+        pipe.execute()
+
+    def run_op(self, client, i):
+        if random.random() < self.read_ratio:
+            client.get(self._key(i))
+        else:
+            client.set(self._key(i), self.value)
+
+    def memory_report(self, client):
+        return memory_per_element(client, [self._key(i) for i in range(self.key_space)], 1)
+
+    def teardown(self, client):
+        keys = [self._key(i) for i in range(self.key_space)]
+        for start in range(0, len(keys), 500):
+            client.delete(*keys[start:start + 500])
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "key_space": self.key_space,
+            "value_size": self.value_size,
+            "read_ratio": self.read_ratio
+        }
+
+
+# Workloads that can be selected by name from the API
+WORKLOADS = {
+    StringWorkload.name: StringWorkload,
+}
+
+
+def create_workload(name, **params):
+    """Create a registered workload by name"""
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {name}. Available: {', '.join(sorted(WORKLOADS))}")
+    return WORKLOADS[name](**params)
+
+
+def validate_run_size(operations, threads):
+    """Reject operation/thread counts that would run nothing"""
+    if threads < 1:
+        raise ValueError("threads must be at least 1")
+    if operations < 0:
+        raise ValueError("operations must not be negative")
+
+
+def run_benchmark(client, workload, operations=1000, threads=1, include_histogram=False,
+                  skip_setup=False, start_at=None):
+    """
+    Run a workload and measure per-operation latency.
+    operations is the total across all threads. If start_at (epoch seconds) is given,
+    timing starts at that instant so several runners can begin together.
+    """
+    validate_run_size(operations, threads)
+    start_time = time.time()
+    setup_started = False
+    try:
+        if client is None:
+            return {"status": "fail", "error": "No Redis client available"}
+
+        memory = None
+        if not skip_setup:
+            setup_started = True
+            workload.setup(client)
+            try:
+                memory = workload.memory_report(client)
+            except Exception as e:
+                # MEMORY USAGE may be restricted; the benchmark is still valid without it
+                logger.warning(f"Memory report for {workload.name} unavailable: {e}")
+
+        histograms = [LatencyHistogram() for _ in range(threads)]
+        errors = [0] * threads
+        per_thread = [operations // threads + (1 if t < operations % threads else 0)
+                      for t in range(threads)]
+
+        def worker(index):
+            histogram = histograms[index]
+            offset = sum(per_thread[:index])
+            for i in range(offset, offset + per_thread[index]):
+                op_start = time.perf_counter()
+                try:
+                    workload.run_op(client, i)
+                except Exception as e:
+                    errors[index] += 1
+                    if errors[index] == 1:
+                        logger.warning(f"{workload.name} operation failed: {e}")
+                    continue
+                histogram.record((time.perf_counter() - op_start) * 1000)
+
+        if start_at is not None:
+            delay = start_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+        run_start = time.perf_counter()
+        workers = [threading.Thread(target=worker, args=(t,), daemon=True) for t in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        run_seconds = time.perf_counter() - run_start
+
+        histogram = LatencyHistogram()
+        for thread_histogram in histograms:
+            histogram.merge(thread_histogram)
+
+        result = {
+            "status": "pass" if sum(errors) == 0 else "fail",
+            "workload": workload.describe(),
+            "operations": histogram.count,
+            "errors": sum(errors),
+            "threads": threads,
+            "run_seconds": round(run_seconds, 3),
+            "ops_per_second": round(histogram.count / run_seconds, 2) if run_seconds > 0 else 0.0,
+            "latency": histogram.summary(),
+            "duration_ms": round((time.time() - start_time) * 1000, 2)
+        }
+        if memory is not None:
+            result["memory"] = memory
+        if include_histogram:
+            result["histogram"] = histogram.to_dict()
+        return result
+    except Exception as e:
+        duration_ms = (time.time() - start_time) * 1000
+        logger.error(f"Benchmark {workload.name} failed: {e}")
+        return {
+            "status": "fail",
+            "error": str(e),
+            "duration_ms": round(duration_ms, 2)
+        }
+    finally:
+        # Also clean up after a partial setup, so benchmark keys never stay on the target
+        if setup_started:
+            try:
+                workload.teardown(client)
+            except Exception as e:
+                logger.warning(f"Teardown for {workload.name} failed: {e}")
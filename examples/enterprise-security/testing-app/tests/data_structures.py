@@ -0,0 +1,262 @@
+"""
+Data-Structure Workloads
+Hash, sorted set, list queue and stream benchmark engines with tunable collection sizes
+"""
+import random
+import time
+import logging
+from datetime import datetime
+from utils.redis_client import redis_client
+from tests.benchmark import Workload, WORKLOADS, create_workload, run_benchmark, memory_per_element
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionWorkload(Workload):
+    """Shared helpers for workloads that spread load over several collection keys"""
+
+    def __init__(self, collections=1, read_ratio=0.8, key_prefix=None):
+        super().__init__(key_prefix)
+        self.collections = max(1, collections)
+        self.read_ratio = read_ratio
+
+    def _key(self, i):
+        return f"{self.key_prefix}:{i % self.collections}"
+
+    def keys(self):
+        return [self._key(i) for i in range(self.collections)]
+
+    def teardown(self, client):
+        keys = self.keys()
+        for start in range(0, len(keys), 500):
+            client.delete(*keys[start:start + 500])
+
+
+class HashWorkload(CollectionWorkload):
+    """HSET single-field updates and HGETALL reads on hashes of a given field count"""
+
+    name = "hash"
+
+    def __init__(self, collections=100, fields=10, field_size=32, read_ratio=0.8, key_prefix=None):
+        super().__init__(collections, read_ratio, key_prefix)
+        self.fields = max(1, fields)
+        self.field_size = field_size
+        self.value = "x" * field_size
+
+    def setup(self, client):
+        mapping = {f"f{n}": self.value for n in range(self.fields)}
+        pipe = client.pipeline(transaction=False)
+        for key in self.keys():
+            pipe.hset(key, mapping=mapping)
+        pipe.execute()
+
+    def run_op(self, client, i):
+        key = self._key(i)
+        if random.random() < self.read_ratio:
+            client.hgetall(key)
+        else:
+            client.hset(key, f"f{random.randrange(self.fields)}", self.value)
+
+    def memory_report(self, client):
+        return memory_per_element(client, self.keys(), self.fields)
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "collections": self.collections,
+            "fields": self.fields,
+            "field_size": self.field_size,
+            "read_ratio": self.read_ratio
+        }
+
+
+class SortedSetWorkload(CollectionWorkload):
+    """Leaderboard workload: ZADD score updates and ZRANGEBYSCORE window reads"""
+
+    name = "zset"
+
+    def __init__(self, collections=1, members=1000, range_size=10, read_ratio=0.8, key_prefix=None):
+        super().__init__(collections, read_ratio, key_prefix)
+        self.members = max(1, members)
+        self.range_size = range_size
+        self.max_score = self.members * 10
+
+    def setup(self, client):
+        for key in self.keys():
+            for start in range(0, self.members, 1000):
+                scores = {f"player:{n}": random.randint(0, self.max_score)
+                          for n in range(start, min(start + 1000, self.members))}
+                client.zadd(key, scores)
+
+    def run_op(self, client, i):
+        key = self._key(i)
+        if random.random() < self.read_ratio:
+            low = random.randint(0, self.max_score)
+            client.zrangebyscore(key, low, "+inf", start=0, num=self.range_size, withscores=True)
+        else:
+            client.zadd(key, {f"player:{random.randrange(self.members)}": random.randint(0, self.max_score)})
+
+    def memory_report(self, client):
+        return memory_per_element(client, self.keys(), self.members)
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "collections": self.collections,
+            "members": self.members,
+            "range_size": self.range_size,
+            "read_ratio": self.read_ratio
+        }
+
+
+class ListQueueWorkload(CollectionWorkload):
+    """Queue workload alternating LPUSH and BRPOP on lists kept at a steady depth"""
+
+    name = "list"
+
+    def __init__(self, collections=1, queue_depth=1000, value_size=100, pop_timeout=1, key_prefix=None):
+        super().__init__(collections, 0.5, key_prefix)
+        self.queue_depth = max(1, queue_depth)
+        self.value_size = value_size
+        self.pop_timeout = pop_timeout
+        self.value = "x" * value_size
+
+    def setup(self, client):
+        for key in self.keys():
+            for start in range(0, self.queue_depth, 1000):
+                client.lpush(key, *([self.value] * min(1000, self.queue_depth - start)))
+
+    def run_op(self, client, i):
+        key = self._key(i // 2)
+        # Even ops push, odd ops pop, so depth stays roughly at queue_depth
+        if i % 2 == 0:
+            client.lpush(key, self.value)
+        else:
+            client.brpop(key, timeout=self.pop_timeout)
+
+    def memory_report(self, client):
+        return memory_per_element(client, self.keys(), self.queue_depth)
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "collections": self.collections,
+            "queue_depth": self.queue_depth,
+            "value_size": self.value_size
+        }
+
+
+class StreamWorkload(CollectionWorkload):
+    """Stream workload alternating XADD with XREADGROUP + XACK through a consumer group"""
+
+    name = "stream"
+    group = "bench"
+
+    def __init__(self, collections=1, stream_length=1000, fields=5, field_size=32, batch=10,
+                 key_prefix=None):
+        super().__init__(collections, 0.5, key_prefix)
+        self.stream_length = max(1, stream_length)
+        self.fields = max(1, fields)
+        self.field_size = field_size
+        self.batch = batch
+        self.entry = {f"f{n}": "x" * field_size for n in range(self.fields)}
+
+    def setup(self, client):
+        for key in self.keys():
+            pipe = client.pipeline(transaction=False)
+            for _ in range(self.stream_length):
+                pipe.xadd(key, self.entry)
+            pipe.execute()
+            client.xgroup_create(key, self.group, id="0")
+
+    def run_op(self, client, i):
+        key = self._key(i // 2)
+        if i % 2 == 0:
+            # Approximate trimming keeps the stream near its configured length
+            client.xadd(key, self.entry, maxlen=self.stream_length, approximate=True)
+        else:
+            entries = client.xreadgroup(self.group, "consumer", {key: ">"}, count=self.batch)
+            ids = [entry_id for _, messages in entries or [] for entry_id, _ in messages]
+            if ids:
+                client.xack(key, self.group, *ids)
+
+    def memory_report(self, client):
+        return memory_per_element(client, self.keys(), self.stream_length)
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "collections": self.collections,
+            "stream_length": self.stream_length,
+            "fields": self.fields,
+            "field_size": self.field_size,
+            "batch": self.batch
+        }
+
+
+WORKLOADS.update({
+    HashWorkload.name: HashWorkload,
+    SortedSetWorkload.name: SortedSetWorkload,
+    ListQueueWorkload.name: ListQueueWorkload,
+    StreamWorkload.name: StreamWorkload,
+})
+
+# Parameter that controls collection size for each workload
+SIZE_PARAMS = {
+    HashWorkload.name: "fields",
+    SortedSetWorkload.name: "members",
+    ListQueueWorkload.name: "queue_depth",
+    StreamWorkload.name: "stream_length",
+}
+
+
+class DataStructureSuite:
+    """Runs data-structure workloads, optionally sweeping collection size"""
+
+    def __init__(self, client=None):
+        self.client = client or redis_client.get_client()
+
+    def run_workload(self, workload_name, params=None, operations=1000, threads=1):
+        """Run a single data-structure workload"""
+        workload = create_workload(workload_name, **(params or {}))
+        return run_benchmark(self.client, workload, operations=operations, threads=threads)
+
+    def run_size_sweep(self, workload_name, sizes, params=None, operations=1000, threads=1):
+        """Run a workload at several collection sizes to show how size affects latency"""
+        if workload_name not in SIZE_PARAMS:
+            raise ValueError(f"Size sweep not supported for workload: {workload_name}")
+        size_param = SIZE_PARAMS[workload_name]
+        start_time = time.time()
+
+        results = []
+        for size in sizes:
+            run_params = dict(params or {})
+            run_params[size_param] = size
+            result = self.run_workload(workload_name, run_params, operations, threads)
+            latency = result.get("latency", {})
+            memory = result.get("memory") or {}
+            results.append({
+                size_param: size,
+                "status": result.get("status"),
+                "ops_per_second": result.get("ops_per_second", 0.0),
+                "p50_ms": latency.get("p50_ms"),
+                "p95_ms": latency.get("p95_ms"),
+                "p99_ms": latency.get("p99_ms"),
+                "bytes_per_element": memory.get("bytes_per_element"),
+                "error": result.get("error")
+            })
+
+        failed = [row[size_param] for row in results if row["status"] != "pass"]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "fail" if failed else "success",
+            "workload": workload_name,
+            "size_param": size_param,
+            "operations_per_size": operations,
+            "results": results,
+            "total_duration_ms": round((time.time() - start_time) * 1000, 2)
+        }
+
+
+# Global data-structure suite instance
+data_structure_suite = DataStructureSuite()
@@ -0,0 +1,371 @@
+"""
+Distributed Load
+Coordinates several app instances or CLI processes running one workload against the same target.
+
+Workers enroll through a coordinator key space (a separate Redis given by COORDINATOR_REDIS_URL,
+or the target itself as a stand-in), prepare their data, wait at a barrier, start together and push
+mergeable latency histograms back for one aggregated report. Start times and run windows are
+expressed on the coordinator's clock (Redis TIME), so skew between hosts does not distort them.
+
+CLI usage (see tests/distributed_cli.py):
+    python -m tests.distributed_cli worker
+    python -m tests.distributed_cli run --workers 4 --workload string --operations 100000
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+import logging
+from datetime import datetime
+from config import Config
+from utils.redis_client import redis_client
+from utils.histogram import LatencyHistogram
+from utils.targets import target_registry
+from tests.benchmark import create_workload, run_benchmark
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "dist"
+# Coordinator keys expire on their own so abandoned runs do not accumulate
+RUN_TTL_SECONDS = 24 * 3600
+CLOCK_SAMPLES = 5
+# Extra time workers wait at the barrier beyond enroll_timeout + start_delay
+BARRIER_MARGIN_SECONDS = 30
+
+
+def _key(run_id, name):
+    return f"{KEY_PREFIX}:{run_id}:{name}"
+
+
+def get_coordinator_client():
+    """Get the coordinator Redis client, falling back to the target Redis as a stand-in"""
+    if Config.COORDINATOR_REDIS_URL:
+        import redis
+        return redis.from_url(Config.COORDINATOR_REDIS_URL, decode_responses=True)
+    return redis_client.get_client()
+
+
+def default_worker_id():
+    # WEBSITE_INSTANCE_ID distinguishes scaled-out App Service instances
+    instance = os.environ.get('WEBSITE_INSTANCE_ID', socket.gethostname())[:12]
+    return f"{instance}-{os.getpid()}"
+
+
+def _touch(coord, run_id):
+    """Apply the run TTL to the keys workers create"""
+    for name in ('workers', 'ready', 'results'):
+        coord.expire(_key(run_id, name), RUN_TTL_SECONDS)
+
+
+def coordinator_time(coord):
+    """Get the coordinator's clock in epoch seconds"""
+    seconds, microseconds = coord.time()
+    return seconds + microseconds / 1e6
+
+
+def measure_clock_offset(coord, samples=CLOCK_SAMPLES):
+    """
+    Estimate coordinator clock minus local clock, NTP style.
+    Keeps the sample with the smallest round trip, which bounds the error to rtt/2.
+    """
+    best = None
+    for _ in range(samples):
+        t0 = time.time()
+        server = coordinator_time(coord)
+        t1 = time.time()
+        rtt = t1 - t0
+        if best is None or rtt < best[1]:
+            best = (server - (t0 + t1) / 2, rtt)
+    return best
+
+
+class DistributedWorker:
+    """Enrolls in distributed runs and executes its share of the workload"""
+
+    def __init__(self, coord=None, worker_id=None, poll_interval=None):
+        self.coord = coord
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or Config.DISTRIBUTED_POLL_INTERVAL
+        self.completed = set()
+        self._stop = threading.Event()
+
+    def _coord(self):
+        if self.coord is None:
+            self.coord = get_coordinator_client()
+        return self.coord
+
+    def _target_client(self, spec):
+        if spec.get('target'):
+            return target_registry.get(spec['target']).get_client()
+        return redis_client.get_client()
+
+    def _wait_for_start(self, run_id, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            start_at = self._coord().get(_key(run_id, 'start_at'))
+            if start_at:
+                return float(start_at)
+            if self._coord().get(_key(run_id, 'status')) == 'aborted':
+                return None
+            time.sleep(0.05)
+        return None
+
+    def join(self, run_id):
+        """Take part in one run: enroll, prepare, wait at the barrier, run, report"""
+        coord = self._coord()
+        spec_json = coord.get(_key(run_id, 'spec'))
+        if not spec_json:
+            raise ValueError(f"Unknown distributed run: {run_id}")
+        spec = json.loads(spec_json)
+
+        coord.sadd(_key(run_id, 'workers'), self.worker_id)
+        _touch(coord, run_id)
+        logger.info(f"Worker {self.worker_id} enrolled in run {run_id}")
+
+        client = workload = None
+        try:
+            client = self._target_client(spec)
+            if client is None:
+                raise RuntimeError("No Redis client available")
+            params = dict(spec.get('params') or {})
+            params['key_prefix'] = f"bench:dist:{run_id}:{self.worker_id}"
+            workload = create_workload(spec['workload'], **params)
+            workload.setup(client)
+            offset, rtt = measure_clock_offset(coord)
+            coord.sadd(_key(run_id, 'ready'), self.worker_id)
+
+            barrier_timeout = spec.get('barrier_timeout') or (
+                spec['enroll_timeout'] + spec['start_delay'] + BARRIER_MARGIN_SECONDS)
+            start_at = self._wait_for_start(run_id, barrier_timeout)
+            if start_at is None:
+                raise RuntimeError("Run was aborted or barrier timed out")
+
+            # start_at is on the coordinator clock; convert to local before sleeping
+            result = run_benchmark(client, workload, operations=spec['operations_per_worker'],
+                                   threads=spec.get('threads', 1), include_histogram=True,
+                                   skip_setup=True, start_at=start_at - offset)
+            end = time.time() + offset
+            result.update({
+                "worker_id": self.worker_id,
+                "clock_offset_ms": round(offset * 1000, 3),
+                "clock_rtt_ms": round(rtt * 1000, 3),
+                "start": end - result.get("run_seconds", 0.0),
+                "end": end
+            })
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} failed in run {run_id}: {e}")
+            result = {"status": "fail", "error": str(e), "worker_id": self.worker_id}
+        finally:
+            try:
+                if workload is not None:
+                    workload.teardown(client)
+            except Exception as e:
+                logger.warning(f"Teardown failed for run {run_id}: {e}")
+
+        coord.hset(_key(run_id, 'results'), self.worker_id, json.dumps(result))
+        # A failed worker still counts as ready so the barrier is not held up
+        coord.sadd(_key(run_id, 'ready'), self.worker_id)
+        _touch(coord, run_id)
+        self.completed.add(run_id)
+        return result
+
+    def poll_once(self):
+        """Join the current run if it is still enrolling and not yet done here"""
+        coord = self._coord()
+        run_id = coord.get(f"{KEY_PREFIX}:current")
+        if not run_id or run_id in self.completed:
+            return None
+        if coord.get(_key(run_id, 'status')) != 'enrolling':
+            return None
+        return self.join(run_id)
+
+    def serve(self):
+        """Poll for runs until stopped"""
+        logger.info(f"Distributed worker {self.worker_id} polling for runs")
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Distributed worker poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def start_background(self):
+        """Run serve() in a daemon thread"""
+        thread = threading.Thread(target=self.serve, name="distributed-worker", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+class DistributedCoordinator:
+    """Creates runs, releases the start barrier and aggregates worker results"""
+
+    def __init__(self, coord=None):
+        self.coord = coord
+
+    def _coord(self):
+        if self.coord is None:
+            self.coord = get_coordinator_client()
+        return self.coord
+
+    def create_run(self, workload='string', params=None, operations_per_worker=1000, threads=1,
+                   expected_workers=1, target=None, enroll_timeout=30, start_delay=2.0,
+                   barrier_timeout=None):
+        """
+        Publish a run spec and make it the current run for polling workers.
+        barrier_timeout (how long workers wait for the start time) defaults to
+        enroll_timeout + start_delay + BARRIER_MARGIN_SECONDS.
+        """
+        if barrier_timeout is None:
+            barrier_timeout = enroll_timeout + start_delay + BARRIER_MARGIN_SECONDS
+        elif barrier_timeout <= enroll_timeout + start_delay:
+            # Workers would give up before the coordinator publishes the start time
+            raise ValueError("barrier_timeout must be greater than enroll_timeout + start_delay")
+        create_workload(workload, **(params or {}))
+        if target:
+            target_registry.get(target)
+        coord = self._coord()
+        run_id = uuid.uuid4().hex[:12]
+        spec = {
+            "run_id": run_id,
+            "workload": workload,
+            "params": params or {},
+            "operations_per_worker": operations_per_worker,
+            "threads": threads,
+            "expected_workers": expected_workers,
+            "target": target,
+            "enroll_timeout": enroll_timeout,
+            "start_delay": start_delay,
+            "barrier_timeout": barrier_timeout,
+            "created": datetime.utcnow().isoformat()
+        }
+        pipe = coord.pipeline(transaction=True)
+        pipe.set(_key(run_id, 'spec'), json.dumps(spec), ex=RUN_TTL_SECONDS)
+        pipe.set(_key(run_id, 'status'), 'enrolling', ex=RUN_TTL_SECONDS)
+        pipe.set(f"{KEY_PREFIX}:current", run_id, ex=RUN_TTL_SECONDS)
+        pipe.execute()
+        logger.info(f"Created distributed run {run_id} expecting {expected_workers} worker(s)")
+        return run_id
+
+    def release_barrier(self, run_id):
+        """
+        Wait until the expected workers are ready (or enroll_timeout passes),
+        then publish a common start time on the coordinator clock.
+        """
+        coord = self._coord()
+        spec = json.loads(coord.get(_key(run_id, 'spec')))
+        deadline = time.time() + spec['enroll_timeout']
+        while time.time() < deadline:
+            if coord.scard(_key(run_id, 'ready')) >= spec['expected_workers']:
+                break
+            time.sleep(0.1)
+
+        # Late enrollers still setting up are not waited for past the timeout
+        ready = coord.scard(_key(run_id, 'ready'))
+        if ready == 0:
+            coord.set(_key(run_id, 'status'), 'aborted', ex=RUN_TTL_SECONDS)
+            raise RuntimeError(f"No workers ready for run {run_id}")
+
+        start_at = coordinator_time(coord) + spec['start_delay']
+        pipe = coord.pipeline(transaction=True)
+        pipe.set(_key(run_id, 'start_at'), repr(start_at), ex=RUN_TTL_SECONDS)
+        pipe.set(_key(run_id, 'status'), 'running', ex=RUN_TTL_SECONDS)
+        pipe.execute()
+        logger.info(f"Released barrier for run {run_id} with {ready} worker(s)")
+        return start_at
+
+    def collect(self, run_id, timeout=600):
+        """Wait for every enrolled worker's result and merge them"""
+        coord = self._coord()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if coord.hlen(_key(run_id, 'results')) >= coord.scard(_key(run_id, 'workers')):
+                break
+            time.sleep(0.2)
+        coord.set(_key(run_id, 'status'), 'complete', ex=RUN_TTL_SECONDS)
+        return self.report(run_id)
+
+    def report(self, run_id):
+        """Build the aggregated report from whatever results have arrived"""
+        coord = self._coord()
+        spec_json = coord.get(_key(run_id, 'spec'))
+        if not spec_json:
+            raise KeyError(f"Unknown distributed run: {run_id}")
+        spec = json.loads(spec_json)
+        raw = coord.hgetall(_key(run_id, 'results'))
+        enrolled = coord.smembers(_key(run_id, 'workers'))
+
+        histogram = LatencyHistogram()
+        workers = []
+        starts, ends = [], []
+        errors = 0
+        for worker_id, payload in sorted(raw.items()):
+            result = json.loads(payload)
+            if "histogram" in result:
+                histogram.merge(LatencyHistogram.from_dict(result["histogram"]))
+            if result.get("start") is not None:
+                starts.append(result["start"])
+                ends.append(result["end"])
+            errors += result.get("errors", 0)
+            workers.append({
+                "worker_id": worker_id,
+                "status": result.get("status"),
+                "operations": result.get("operations", 0),
+                "ops_per_second": result.get("ops_per_second", 0.0),
+                "p99_ms": result.get("latency", {}).get("p99_ms"),
+                "clock_offset_ms": result.get("clock_offset_ms"),
+                "clock_rtt_ms": result.get("clock_rtt_ms"),
+                "error": result.get("error")
+            })
+
+        window = (max(ends) - min(starts)) if starts else 0.0
+        offsets = [w["clock_offset_ms"] for w in workers if w["clock_offset_ms"] is not None]
+        missing = sorted(set(enrolled) - set(raw))
+        failed = [w["worker_id"] for w in workers if w["status"] != "pass"]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "run_id": run_id,
+            "status": coord.get(_key(run_id, 'status')),
+            "result": "fail" if failed or missing or not workers else "success",
+            "spec": spec,
+            "workers_enrolled": len(enrolled),
+            "workers_reported": len(workers),
+            "missing_workers": missing,
+            "failed_workers": failed,
+            "total_operations": histogram.count,
+            "errors": errors,
+            "window_seconds": round(window, 3),
+            "aggregate_ops_per_second": round(histogram.count / window, 2) if window > 0 else 0.0,
+            "start_spread_ms": round((max(starts) - min(starts)) * 1000, 3) if starts else None,
+            "max_clock_skew_ms": round(max(offsets) - min(offsets), 3) if offsets else None,
+            "latency": histogram.summary(),
+            "workers": workers
+        }
+
+    def run(self, **spec):
+        """Create a run, release the barrier and collect the aggregated report"""
+        run_id = self.create_run(**spec)
+        self.release_barrier(run_id)
+        return self.collect(run_id)
+
+    def run_in_background(self, **spec):
+        """Create a run and coordinate it from a daemon thread; returns the run id"""
+        run_id = self.create_run(**spec)
+
+        def coordinate():
+            try:
+                self.release_barrier(run_id)
+                self.collect(run_id)
+            except Exception as e:
+                logger.error(f"Distributed run {run_id} failed: {e}")
+
+        threading.Thread(target=coordinate, name=f"coordinator-{run_id}", daemon=True).start()
+        return run_id
+
+
+# Global coordinator instance
+distributed_coordinator = DistributedCoordinator()
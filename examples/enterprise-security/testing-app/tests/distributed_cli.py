@@ -0,0 +1,46 @@
+"""
+Distributed Load CLI
+Entry point for worker and coordinator processes. Kept out of the tests package imports so
+running it with -m does not load tests.distributed twice.
+
+Usage:
+    python -m tests.distributed_cli worker
+    python -m tests.distributed_cli run --workers 4 --workload string --operations 100000
+"""
+import argparse
+import json
+from tests.distributed import distributed_coordinator, DistributedWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Redis load worker/coordinator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("worker", help="Poll the coordinator and join runs")
+    run_parser = subparsers.add_parser("run", help="Coordinate one run and print the report")
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--workload", default="string")
+    run_parser.add_argument("--params", default="{}", help="Workload parameters as JSON")
+    run_parser.add_argument("--operations", type=int, default=1000, help="Operations per worker")
+    run_parser.add_argument("--threads", type=int, default=1)
+    run_parser.add_argument("--target", default=None)
+    args = parser.parse_args()
+
+    from utils import setup_logging
+    setup_logging()
+
+    if args.command == "worker":
+        DistributedWorker().serve()
+    else:
+        report = distributed_coordinator.run(
+            workload=args.workload,
+            params=json.loads(args.params),
+            operations_per_worker=args.operations,
+            threads=args.threads,
+            expected_workers=args.workers,
+            target=args.target
+        )
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Key-Space Analyzer
+Incrementally SCANs the key space and attributes memory to key prefixes and encodings
+"""
+import heapq
+import time
+import zlib
+import logging
+from datetime import datetime
+from utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Prefix buckets kept before new prefixes are folded into OTHER_PREFIX
+MAX_PREFIXES = 5000
+OTHER_PREFIX = "<other>"
+NO_PREFIX = "<no-prefix>"
+SAMPLE_HEADROOM = 0.8
+
+# Packing small strings into hashes: values up to hash-max-listpack-value stay in a listpack
+PACK_VALUE_LIMIT = 64
+# Approximate listpack cost per field/value pair (entry headers and backlen bytes)
+LISTPACK_PAIR_OVERHEAD = 4
+# Fields per bucket hash, below the default hash-max-listpack-entries of 128
+PACK_BUCKET_SIZE = 100
+# Approximate fixed cost of one bucket hash key, amortized over its fields
+PACK_BUCKET_OVERHEAD = 90
+
+
+class PrefixStats:
+    """Aggregated counters for one key prefix"""
+
+    __slots__ = ('keys', 'bytes', 'types', 'pack_keys', 'pack_bytes', 'packed_bytes')
+
+    def __init__(self):
+        self.keys = 0
+        self.bytes = 0
+        self.types = {}
+        self.pack_keys = 0
+        self.pack_bytes = 0
+        self.packed_bytes = 0.0
+
+
+class KeyspaceAnalyzer:
+    """Memory footprint and encoding analysis in bounded memory"""
+
+    def __init__(self, client=None):
+        self.client = client or redis_client.get_client()
+
+    @staticmethod
+    def key_prefix(key, delimiter=':', depth=1):
+        """Get the prefix of a key: up to depth segments, never the whole key"""
+        parts = key.split(delimiter)
+        if len(parts) < 2:
+            return NO_PREFIX
+        return delimiter.join(parts[:min(depth, len(parts) - 1)]) + delimiter + '*'
+
+    @staticmethod
+    def _sampled(key, sample_rate):
+        # Deterministic per key, so repeated runs sample the same keys
+        if sample_rate >= 1.0:
+            return True
+        return (zlib.crc32(key.encode()) % 10000) < sample_rate * 10000
+
+    def _inspect(self, keys, memory_samples):
+        """Pipeline TYPE, MEMORY USAGE, OBJECT ENCODING and STRLEN for a batch of keys"""
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+            pipe.memory_usage(key, samples=memory_samples)
+            pipe.object('encoding', key)
+            pipe.strlen(key)
+        replies = pipe.execute(raise_on_error=False)
+        for n, key in enumerate(keys):
+            key_type, usage, encoding, strlen = replies[n * 4:n * 4 + 4]
+            # Keys can expire between SCAN and inspection
+            if key_type == 'none' or isinstance(usage, Exception) or usage is None:
+                continue
+            if isinstance(encoding, Exception):
+                encoding = 'unknown'
+            if isinstance(strlen, Exception) or key_type != 'string':
+                strlen = None
+            yield key, key_type, usage, encoding, strlen
+
+    @staticmethod
+    def _validate(delimiter, sample_rate, time_budget_seconds, **counts):
+        """Reject bad parameters up front so callers can report them as client errors"""
+        if not isinstance(delimiter, str) or not delimiter:
+            raise ValueError("delimiter must be a non-empty string")
+        for name, value in counts.items():
+            # MEMORY USAGE accepts SAMPLES 0 (all elements); every other count must be positive
+            minimum = 0 if name == 'memory_samples' else 1
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(f"{name} must be an integer >= {minimum}")
+        rates = {'time_budget_seconds': time_budget_seconds}
+        if sample_rate is not None:
+            rates['sample_rate'] = sample_rate
+        for name, value in rates.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{name} must be a positive number")
+
+    def analyze(self, match='*', delimiter=':', prefix_depth=1, scan_count=1000, batch_size=500,
+                max_keys=100000, sample_rate=None, memory_samples=5, time_budget_seconds=60,
+                top=25):
+        """
+        Scan the key space and aggregate bytes by prefix and by type/encoding.
+        On large databases only a sample is inspected: sample_rate defaults to
+        0.8 * max_keys / DBSIZE, and totals are scaled up by 1 / sample_rate.
+        """
+        self._validate(delimiter, sample_rate, time_budget_seconds, prefix_depth=prefix_depth,
+                       scan_count=scan_count, batch_size=batch_size, max_keys=max_keys,
+                       memory_samples=memory_samples, top=top)
+        start_time = time.time()
+        try:
+            if self.client is None:
+                return {"status": "fail", "error": "No Redis client available"}
+
+            dbsize = self.client.dbsize()
+            if sample_rate is None:
+                # Aim below max_keys so sampling noise rarely cuts the scan short
+                sample_rate = min(1.0, SAMPLE_HEADROOM * max_keys / dbsize) if dbsize else 1.0
+            sample_rate = min(1.0, max(sample_rate, 0.0001))
+
+            prefixes = {}
+            encodings = {}
+            largest = []
+            scanned = inspected = inspected_bytes = 0
+            truncated = False
+            batch = []
+
+            def flush():
+                nonlocal inspected, inspected_bytes
+                for key, key_type, usage, encoding, strlen in self._inspect(batch, memory_samples):
+                    inspected += 1
+                    inspected_bytes += usage
+
+                    prefix = self.key_prefix(key, delimiter, prefix_depth)
+                    stats = prefixes.get(prefix)
+                    if stats is None:
+                        if len(prefixes) >= MAX_PREFIXES:
+                            stats = prefixes.setdefault(OTHER_PREFIX, PrefixStats())
+                        else:
+                            stats = prefixes[prefix] = PrefixStats()
+                    stats.keys += 1
+                    stats.bytes += usage
+                    stats.types[key_type] = stats.types.get(key_type, 0) + 1
+
+                    # The hash field is the key minus its real prefix (prefix ends in '*'),
+                    # or the whole key when there is no prefix to name the bucket after
+                    field_len = len(key) if prefix == NO_PREFIX else max(1, len(key) - len(prefix) + 1)
+                    if strlen is not None and strlen <= PACK_VALUE_LIMIT and field_len <= PACK_VALUE_LIMIT:
+                        stats.pack_keys += 1
+                        stats.pack_bytes += usage
+                        stats.packed_bytes += (field_len + strlen + LISTPACK_PAIR_OVERHEAD
+                                               + PACK_BUCKET_OVERHEAD / PACK_BUCKET_SIZE)
+
+                    encoding_key = f"{key_type}:{encoding}"
+                    counts = encodings.setdefault(encoding_key, [0, 0])
+                    counts[0] += 1
+                    counts[1] += usage
+
+                    if len(largest) < top:
+                        heapq.heappush(largest, (usage, key, key_type, encoding))
+                    elif usage > largest[0][0]:
+                        heapq.heapreplace(largest, (usage, key, key_type, encoding))
+                batch.clear()
+
+            for key in self.client.scan_iter(match=match, count=scan_count):
+                scanned += 1
+                if self._sampled(key, sample_rate):
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        flush()
+                if inspected + len(batch) >= max_keys or time.time() - start_time > time_budget_seconds:
+                    truncated = True
+                    break
+            if batch:
+                flush()
+
+            scale = 1.0 / sample_rate
+            by_prefix = sorted(prefixes.items(), key=lambda item: item[1].bytes, reverse=True)
+            pack_bytes = sum(s.pack_bytes for s in prefixes.values())
+            packed_bytes = sum(s.packed_bytes for s in prefixes.values())
+
+            info = self.client.info('memory')
+            return {
+                "timestamp": datetime.utcnow().isoformat(),
+                "status": "pass",
+                "dbsize": dbsize,
+                "scanned_keys": scanned,
+                "inspected_keys": inspected,
+                "sample_rate": round(sample_rate, 4),
+                "truncated": truncated,
+                # A truncated scan did not cover the whole key space, so estimates undercount
+                "estimates_are_lower_bounds": truncated,
+                "used_memory": info.get("used_memory"),
+                "used_memory_dataset": info.get("used_memory_dataset"),
+                "inspected_bytes": inspected_bytes,
+                "estimated_key_bytes": int(inspected_bytes * scale),
+                "by_prefix": [
+                    {
+                        "prefix": prefix,
+                        "keys": stats.keys,
+                        "bytes": stats.bytes,
+                        "avg_bytes": round(stats.bytes / stats.keys, 1),
+                        "estimated_keys": int(stats.keys * scale),
+                        "estimated_bytes": int(stats.bytes * scale),
+                        "types": stats.types
+                    }
+                    for prefix, stats in by_prefix[:top]
+                ],
+                "prefixes_tracked": len(prefixes),
+                "by_encoding": [
+                    {
+                        "type": encoding_key.split(':', 1)[0],
+                        "encoding": encoding_key.split(':', 1)[1],
+                        "keys": counts[0],
+                        "bytes": counts[1],
+                        "estimated_bytes": int(counts[1] * scale)
+                    }
+                    for encoding_key, counts in sorted(encodings.items(), key=lambda item: item[1][1], reverse=True)
+                ],
+                "largest_keys": [
+                    {"key": key, "bytes": usage, "type": key_type, "encoding": encoding}
+                    for usage, key, key_type, encoding in sorted(largest, reverse=True)
+                ],
+                "savings": {
+                    "strategy": f"pack strings and key suffixes <= {PACK_VALUE_LIMIT} bytes into per-prefix hashes "
+                                f"of {PACK_BUCKET_SIZE} fields (listpack encoded)",
+                    "eligible_keys": sum(s.pack_keys for s in prefixes.values()),
+                    # All three are scaled by 1 / sample_rate, so current - packed = savings
+                    "current_bytes": int(pack_bytes * scale),
+                    "packed_bytes_estimate": int(packed_bytes * scale),
+                    "estimated_savings_bytes": int(pack_bytes * scale) - int(packed_bytes * scale),
+                    "by_prefix": sorted([
+                        {
+                            "prefix": prefix,
+                            "eligible_keys": stats.pack_keys,
+                            "estimated_savings_bytes": int((stats.pack_bytes - stats.packed_bytes) * scale)
+                        }
+                        for prefix, stats in prefixes.items() if stats.pack_keys
+                    ], key=lambda row: row["estimated_savings_bytes"], reverse=True)[:top]
+                },
+                "duration_ms": round((time.time() - start_time) * 1000, 2)
+            }
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.error(f"Key-space analysis failed: {e}")
+            return {
+                "status": "fail",
+                "error": str(e),
+                "duration_ms": round(duration_ms, 2)
+            }
+
+
+# Global key-space analyzer instance
+keyspace_analyzer = KeyspaceAnalyzer()
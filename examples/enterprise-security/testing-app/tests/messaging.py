@@ -0,0 +1,287 @@
+"""
+Messaging Benchmark
+End-to-end delivery latency over Pub/Sub, sharded Pub/Sub and Streams consumer groups
+"""
+import threading
+import time
+import logging
+from datetime import datetime
+from redis.cluster import ClusterPubSub
+from redis.crc import key_slot
+from utils.redis_client import redis_client
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+MODES = ('pubsub', 'sharded', 'stream')
+
+# How long subscribers keep draining after the publisher finishes
+DRAIN_TIMEOUT_SECONDS = 5
+
+
+def encode_message(seq, message_size):
+    """Build a payload carrying its send timestamp, padded to message_size"""
+    header = f"{seq}|{time.perf_counter_ns()}|"
+    return header + "x" * max(0, message_size - len(header))
+
+
+def decode_latency_ms(payload):
+    """Get delivery latency in milliseconds from a payload built by encode_message"""
+    sent_ns = int(payload.split("|", 2)[1])
+    return (time.perf_counter_ns() - sent_ns) / 1e6
+
+
+class SubscriberStats:
+    """Per-subscriber counters, merged into the report at the end"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.received = 0
+        self.late = 0
+        self.disconnected = False
+        self.error = None
+
+
+class MessagingBenchmark:
+    """Publisher/subscriber benchmark with configurable fan-out and publish rate"""
+
+    def __init__(self, client=None):
+        self.client = client or redis_client.get_client()
+
+    def _channels(self, mode, prefix, channels):
+        if mode == 'stream':
+            # One XREADGROUP reads every stream, so they must share a hash slot
+            return [f"{{{prefix}}}:ch{n}" for n in range(channels)]
+        # No hash tag, so sharded channels spread across slots (one connection per channel)
+        return [f"{prefix}:ch{n}" for n in range(channels)]
+
+    def _pubsub_subscriber(self, mode, channels, stats, ready, publisher_done, stop, consumer_delay_ms):
+        pubsub = self.client.pubsub()
+        released = False
+        try:
+            if mode == 'sharded':
+                pubsub.ssubscribe(*channels)
+                if isinstance(pubsub, ClusterPubSub):
+                    # Read from the node that owns the channel's slot
+                    node = self.client.get_node_from_key(channels[0])
+                    get_message = lambda **kwargs: pubsub.get_sharded_message(target_node=node, **kwargs)
+                else:
+                    get_message = pubsub.get_sharded_message
+            else:
+                pubsub.subscribe(*channels)
+                get_message = pubsub.get_message
+
+            # Wait for every subscribe confirmation before the publisher starts
+            confirmed = 0
+            deadline = time.time() + 5
+            while confirmed < len(channels) and time.time() < deadline:
+                message = get_message(timeout=1.0)
+                if message and message.get('type') in ('subscribe', 'ssubscribe'):
+                    confirmed += 1
+            ready.release()
+            released = True
+
+            while not stop.is_set():
+                message = get_message(timeout=0.1)
+                if not message or message.get('type') not in ('message', 'smessage'):
+                    continue
+                stats.histogram.record(decode_latency_ms(message['data']))
+                stats.received += 1
+                if publisher_done.is_set():
+                    stats.late += 1
+                if consumer_delay_ms:
+                    time.sleep(consumer_delay_ms / 1000.0)
+        except Exception as e:
+            # Slow subscribers can be disconnected by the server's output buffer limit
+            stats.disconnected = True
+            stats.error = str(e)
+            if not released:
+                ready.release()
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+    def _stream_consumer(self, streams, group, stats, ready, publisher_done, stop, consumer_delay_ms, batch):
+        ready.release()
+        offsets = {stream: ">" for stream in streams}
+        try:
+            while not stop.is_set():
+                entries = self.client.xreadgroup(group, "consumer", offsets, count=batch, block=100)
+                for stream, messages in entries or []:
+                    ids = []
+                    for entry_id, fields in messages:
+                        stats.histogram.record(decode_latency_ms(fields['payload']))
+                        stats.received += 1
+                        if publisher_done.is_set():
+                            stats.late += 1
+                        ids.append(entry_id)
+                        if consumer_delay_ms:
+                            time.sleep(consumer_delay_ms / 1000.0)
+                    if ids:
+                        self.client.xack(stream, group, *ids)
+        except Exception as e:
+            stats.disconnected = True
+            stats.error = str(e)
+
+    @staticmethod
+    def _stop_subscribers(stop, threads):
+        stop.set()
+        for thread in threads:
+            if thread.is_alive():
+                thread.join(timeout=2)
+
+    def _stream_backlog(self, streams, groups):
+        """Sum of undelivered (lag) and unacknowledged (pending) entries across groups"""
+        lag = pending = 0
+        for stream in streams:
+            for info in self.client.xinfo_groups(stream):
+                if info.get('name') in groups:
+                    lag += info.get('lag') or 0
+                    pending += info.get('pending') or 0
+        return {"lag": lag, "pending": pending}
+
+    def run(self, mode='pubsub', channels=1, subscribers=1, message_size=128, messages=1000,
+            publish_rate=0, consumer_delay_ms=0, stream_maxlen=None, batch=100):
+        """
+        Publish messages and measure delivery to every subscriber.
+        publish_rate is total messages/sec (0 = as fast as possible). consumer_delay_ms
+        slows each subscriber down to show backlog and drop behavior.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}. Available: {', '.join(MODES)}")
+        if channels < 1 or subscribers < 1:
+            raise ValueError("channels and subscribers must be at least 1")
+        start_time = time.time()
+        stop = threading.Event()
+        threads = []
+        try:
+            if self.client is None:
+                return {"status": "fail", "error": "No Redis client available"}
+
+            prefix = f"bench:msg:{mode}:{int(time.time() * 1000)}"
+            names = self._channels(mode, prefix, channels)
+            groups = [f"group{n}" for n in range(subscribers)]
+
+            if mode == 'stream':
+                for stream in names:
+                    for group in groups:
+                        self.client.xgroup_create(stream, group, id="$", mkstream=True)
+
+            ready = threading.Semaphore(0)
+            publisher_done = threading.Event()
+
+            # Sharded subscribers get one connection per channel, so no SSUBSCRIBE spans slots
+            subscriptions = [[name] for name in names] if mode == 'sharded' else [names]
+            stats = []
+            owners = []
+            for n in range(subscribers):
+                for subscribed in subscriptions:
+                    subscriber_stats = SubscriberStats()
+                    stats.append(subscriber_stats)
+                    owners.append(n)
+                    if mode == 'stream':
+                        target = self._stream_consumer
+                        args = (subscribed, groups[n], subscriber_stats, ready, publisher_done, stop,
+                                consumer_delay_ms, batch)
+                    else:
+                        target = self._pubsub_subscriber
+                        args = (mode, subscribed, subscriber_stats, ready, publisher_done, stop, consumer_delay_ms)
+                    threads.append(threading.Thread(target=target, args=args, daemon=True))
+            for thread in threads:
+                thread.start()
+            for _ in threads:
+                ready.acquire(timeout=10)
+
+            # Publisher, paced against a fixed schedule so slow publishes don't lower the rate
+            publish_start = time.perf_counter()
+            publish_errors = 0
+            for seq in range(messages):
+                if publish_rate:
+                    delay = publish_start + seq / publish_rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                channel = names[seq % channels]
+                payload = encode_message(seq, message_size)
+                try:
+                    if mode == 'pubsub':
+                        self.client.publish(channel, payload)
+                    elif mode == 'sharded':
+                        self.client.spublish(channel, payload)
+                    else:
+                        self.client.xadd(channel, {"payload": payload}, maxlen=stream_maxlen,
+                                         approximate=stream_maxlen is not None)
+                except Exception as e:
+                    publish_errors += 1
+                    if publish_errors == 1:
+                        logger.warning(f"Publish failed: {e}")
+            publish_seconds = time.perf_counter() - publish_start
+            publisher_done.set()
+
+            backlog = self._stream_backlog(names, groups) if mode == 'stream' else None
+
+            # Drain: stop once everything arrived or the drain timeout passes
+            published = messages - publish_errors
+            expected = published * subscribers
+            drain_deadline = time.time() + DRAIN_TIMEOUT_SECONDS
+            while time.time() < drain_deadline and sum(s.received for s in stats) < expected:
+                time.sleep(0.05)
+            delivery_seconds = time.perf_counter() - publish_start
+            self._stop_subscribers(stop, threads)
+
+            if mode == 'stream':
+                final_backlog = self._stream_backlog(names, groups)
+                self.client.delete(*names)
+
+            histogram = LatencyHistogram()
+            for subscriber in stats:
+                histogram.merge(subscriber.histogram)
+            delivered = sum(s.received for s in stats)
+            disconnected = sorted({owners[n] for n, s in enumerate(stats) if s.disconnected})
+
+            result = {
+                "status": "pass" if delivered == expected and not disconnected else "fail",
+                "mode": mode,
+                "channels": channels,
+                "subscribers": subscribers,
+                "message_size": message_size,
+                "published": published,
+                "publish_errors": publish_errors,
+                "publish_rate_target": publish_rate,
+                "publish_rate_achieved": round(published / publish_seconds, 2) if publish_seconds > 0 else 0.0,
+                "expected_deliveries": expected,
+                "delivered": delivered,
+                # Stream entries are not lost, they stay as lag/pending (see backlog_after_drain)
+                ("undelivered" if mode == 'stream' else "dropped"): max(0, expected - delivered),
+                "delivered_per_second": round(delivered / delivery_seconds, 2) if delivery_seconds > 0 else 0.0,
+                "delivered_after_publish_end": sum(s.late for s in stats),
+                "disconnected_subscribers": disconnected,
+                "latency": histogram.summary(),
+                "duration_ms": round((time.time() - start_time) * 1000, 2)
+            }
+            if mode != 'pubsub':
+                # Classic Pub/Sub is not slot-routed; sharded and stream traffic is
+                result["hash_slots"] = len({key_slot(name.encode()) for name in names})
+            if backlog is not None:
+                result["backlog_at_publish_end"] = backlog
+                result["backlog_after_drain"] = final_backlog
+            errors = [s.error for s in stats if s.error]
+            if errors:
+                result["error"] = errors[0]
+            return result
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.error(f"Messaging benchmark ({mode}) failed: {e}")
+            return {
+                "status": "fail",
+                "error": str(e),
+                "duration_ms": round(duration_ms, 2)
+            }
+        finally:
+            # Subscriber threads poll until stopped, so stop them on every exit path
+            self._stop_subscribers(stop, threads)
+
+
+# Global messaging benchmark instance
+messaging_benchmark = MessagingBenchmark()
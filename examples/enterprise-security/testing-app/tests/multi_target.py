@@ -0,0 +1,104 @@
+"""
+Multi-Target Benchmark
+Runs one workload against several registered Redis targets and builds a side-by-side report
+"""
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.targets import target_registry
+from tests.benchmark import create_workload, run_benchmark, validate_run_size
+
+logger = logging.getLogger(__name__)
+
+
+class MultiTargetBenchmark:
+    """Orchestrates one workload across many targets"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or target_registry
+
+    def _run_target(self, target, workload_name, workload_params, operations, threads):
+        # Per-target prefix, so targets that share an endpoint never touch each other's keys
+        params = dict(workload_params)
+        params['key_prefix'] = f"bench:{workload_name}:{target.name}:{uuid.uuid4().hex[:8]}"
+        workload = create_workload(workload_name, **params)
+        client = target.get_client()
+        if client is None:
+            return {"status": "fail", "error": f"Could not connect to target {target.name}"}
+        return run_benchmark(client, workload, operations=operations, threads=threads)
+
+    @staticmethod
+    def _cost_normalize(target, result):
+        ops_per_second = result.get("ops_per_second", 0.0)
+        if target.hourly_cost_usd > 0:
+            return round(ops_per_second / target.hourly_cost_usd, 2)
+        return None
+
+    def run(self, workload_name="string", workload_params=None, operations=1000, threads=1,
+            mode="concurrent", target_names=None):
+        """
+        Run a workload against the selected targets.
+        mode is 'concurrent' (all targets at once) or 'sequential' (one after another).
+        """
+        if mode not in ("concurrent", "sequential"):
+            raise ValueError(f"Unknown mode: {mode}. Use 'concurrent' or 'sequential'")
+        workload_params = workload_params or {}
+        targets = self.registry.select(target_names)
+        # Fail fast on a bad workload or run size before touching any target
+        create_workload(workload_name, **workload_params)
+        validate_run_size(operations, threads)
+
+        logger.info(f"Running {workload_name} benchmark on {len(targets)} target(s) ({mode})")
+        start_time = time.time()
+
+        if mode == "concurrent":
+            with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+                futures = {
+                    target.name: executor.submit(self._run_target, target, workload_name,
+                                                 workload_params, operations, threads)
+                    for target in targets
+                }
+                results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {
+                target.name: self._run_target(target, workload_name, workload_params, operations, threads)
+                for target in targets
+            }
+
+        report = []
+        for target in targets:
+            result = results[target.name]
+            latency = result.get("latency", {})
+            report.append({
+                "target": target.name,
+                "sku": target.sku,
+                "status": result.get("status"),
+                "ops_per_second": result.get("ops_per_second", 0.0),
+                "p50_ms": latency.get("p50_ms"),
+                "p95_ms": latency.get("p95_ms"),
+                "p99_ms": latency.get("p99_ms"),
+                "hourly_cost_usd": target.hourly_cost_usd,
+                "ops_per_second_per_usd_hour": self._cost_normalize(target, result),
+                "error": result.get("error")
+            })
+        report.sort(key=lambda row: row["ops_per_second"], reverse=True)
+
+        failed = [row["target"] for row in report if row["status"] != "pass"]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "fail" if failed else "success",
+            "mode": mode,
+            "workload": workload_name,
+            "operations_per_target": operations,
+            "threads_per_target": threads,
+            "failed_targets": failed,
+            "report": report,
+            "results": results,
+            "total_duration_ms": round((time.time() - start_time) * 1000, 2)
+        }
+
+
+# Global multi-target benchmark instance
+multi_target_benchmark = MultiTargetBenchmark()
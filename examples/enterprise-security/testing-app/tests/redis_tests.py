@@ -2,13 +2,22 @@
 Redis Test Suite
 Comprehensive tests for Redis connectivity and operations
 """
+import io
+import queue
 import time
 import logging
+import logging.handlers
 from datetime import datetime
+from config import Config
 from utils.redis_client import redis_client
+from utils.logger import (NonBlockingQueueHandler, RouteLogSampler, StructuredFormatter,
+                          route_sampler, get_logging_stats)
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for the logging overhead benchmark, which runs on a request thread
+MAX_LOGGING_ITERATIONS = 10000
+
 
 class RedisTestSuite:
     """Test suite for Redis operations"""
@@ -235,6 +244,76 @@ class RedisTestSuite:
                 "duration_ms": round(duration_ms, 2)
             }
     
+    def test_logging_overhead(self, iterations=1000):
+        """Measure the per-request cost of the access logging path on the calling thread"""
+        start_time = time.time()
+        iterations = max(1, min(int(iterations), MAX_LOGGING_ITERATIONS))
+        
+        # Isolated pipeline: own queue, handler and listener, so benchmark records never
+        # reach stdout/App Insights or take space in the live queue
+        # A standalone Logger (not registered, no parent) so concurrent runs don't share handlers
+        bench_logger = logging.Logger('redis_test_app.benchmark', logging.INFO)
+        bench_logger.propagate = False
+        queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=Config.LOG_QUEUE_SIZE))
+        sink = logging.StreamHandler(io.StringIO())
+        sink.setFormatter(StructuredFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        listener = logging.handlers.QueueListener(queue_handler.queue, sink)
+        bench_logger.addHandler(queue_handler)
+        listener.start()
+        try:
+            fields = {
+                "route": "/benchmark",
+                "method": "GET",
+                "status_code": 200,
+                "duration_ms": 0.0,
+                "redis_ms": 0.0,
+                "redis_calls": 0
+            }
+            
+            # Baseline: record below the logger level, filtered out before any handler
+            baseline_start = time.perf_counter()
+            for _ in range(iterations):
+                bench_logger.debug("request completed", extra=fields)
+            baseline_us = (time.perf_counter() - baseline_start) * 1e6 / iterations
+            
+            # Sampling decision only (private sampler so live rate-limit budgets are untouched)
+            sampler = RouteLogSampler(route_sampler.sample_rates, route_sampler.default_rate,
+                                      route_sampler.rate_limit_per_sec)
+            sample_start = time.perf_counter()
+            for _ in range(iterations):
+                sampler.should_log("/benchmark")
+            sample_us = (time.perf_counter() - sample_start) * 1e6 / iterations
+            
+            # Full emit: format and enqueue, as the access log does on the request thread
+            emit_start = time.perf_counter()
+            for _ in range(iterations):
+                bench_logger.info("request completed", extra=fields)
+            emit_us = (time.perf_counter() - emit_start) * 1e6 / iterations
+            
+            duration_ms = (time.time() - start_time) * 1000
+            
+            return {
+                "status": "pass",
+                "iterations": iterations,
+                "baseline_us_per_call": round(baseline_us, 3),
+                "sampling_us_per_call": round(sample_us, 3),
+                "emit_us_per_call": round(emit_us, 3),
+                "overhead_us_per_request": round(sample_us + emit_us - baseline_us, 3),
+                "benchmark_dropped": queue_handler.dropped,
+                "logging": get_logging_stats(),
+                "duration_ms": round(duration_ms, 2)
+            }
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.error(f"Logging overhead test failed: {e}")
+            return {
+                "status": "fail",
+                "error": str(e),
+                "duration_ms": round(duration_ms, 2)
+            }
+        finally:
+            listener.stop()
+    
     def get_redis_info(self):
         """Get Redis server information"""
         try:
@@ -249,6 +328,9 @@ class RedisTestSuite:
                 "uptime_seconds": info.get("uptime_in_seconds", 0),
                 "connected_clients": info.get("connected_clients", 0),
                 "used_memory_human": info.get("used_memory_human", "0"),
+                "used_memory": info.get("used_memory", 0),
+                "used_memory_peak": info.get("used_memory_peak", 0),
+                "maxmemory": info.get("maxmemory", 0),
                 "total_commands_processed": info.get("total_commands_processed", 0),
                 "keyspace": info.get("db0", {})
             }
@@ -0,0 +1,156 @@
+"""
+Scripting Benchmark
+Compares round trips, pipelines, MULTI/EXEC, EVAL/EVALSHA and FCALL for one read-modify-write
+"""
+import time
+import uuid
+import logging
+from datetime import datetime
+from utils.redis_client import redis_client
+from tests.benchmark import Workload, WORKLOADS, run_benchmark
+
+logger = logging.getLogger(__name__)
+
+# The logical operation: the INCR + TTL sequence used by test_incr_operation/test_ttl_operation,
+# i.e. increment a counter, refresh its expiry and read back value and remaining TTL
+INCR_TTL_SCRIPT = """
+local value = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return {value, redis.call('TTL', KEYS[1])}
+"""
+
+# Functions get keys/args parameters instead of the KEYS/ARGV globals scripts use.
+# Library and function names are server-wide, so each workload fills in its own.
+FUNCTION_CODE = """#!lua name={library}
+redis.register_function('{function}', function(keys, args)
+local value = redis.call('INCR', keys[1])
+redis.call('EXPIRE', keys[1], args[1])
+return {{value, redis.call('TTL', keys[1])}}
+end)
+"""
+
+APPROACHES = ('commands', 'pipeline', 'multi_exec', 'eval', 'evalsha', 'fcall')
+
+
+class IncrTtlWorkload(Workload):
+    """Runs the INCR + EXPIRE + TTL operation using one of the APPROACHES"""
+
+    name = "incr_ttl"
+
+    def __init__(self, approach='commands', keys=100, ttl=60, key_prefix=None):
+        if approach not in APPROACHES:
+            raise ValueError(f"Unknown approach: {approach}. Available: {', '.join(APPROACHES)}")
+        super().__init__(key_prefix)
+        self.approach = approach
+        self.keys = max(1, keys)
+        self.ttl = ttl
+        self.script = None
+        # Unique per workload so concurrent runs never replace or delete each other's library
+        suffix = uuid.uuid4().hex[:8]
+        self.function_library = f"benchlib_{suffix}"
+        self.function_name = f"bench_incr_ttl_{suffix}"
+
+    def _key(self, i):
+        return f"{self.key_prefix}:{i % self.keys}"
+
+    def setup(self, client):
+        if self.approach == 'evalsha':
+            self.script = client.register_script(INCR_TTL_SCRIPT)
+            # Load up front; otherwise the first timed op per thread pays the NOSCRIPT retry
+            client.script_load(INCR_TTL_SCRIPT)
+        elif self.approach == 'fcall':
+            client.function_load(FUNCTION_CODE.format(library=self.function_library,
+                                                      function=self.function_name))
+
+    def run_op(self, client, i):
+        key = self._key(i)
+        if self.approach == 'commands':
+            client.incr(key)
+            client.expire(key, self.ttl)
+            client.ttl(key)
+        elif self.approach in ('pipeline', 'multi_exec'):
+            pipe = client.pipeline(transaction=self.approach == 'multi_exec')
+            pipe.incr(key)
+            pipe.expire(key, self.ttl)
+            pipe.ttl(key)
+            pipe.execute()
+        elif self.approach == 'eval':
+            client.eval(INCR_TTL_SCRIPT, 1, key, self.ttl)
+        elif self.approach == 'evalsha':
+            self.script(keys=[key], args=[self.ttl], client=client)
+        else:
+            client.fcall(self.function_name, 1, key, self.ttl)
+
+    def teardown(self, client):
+        keys = [self._key(i) for i in range(self.keys)]
+        for start in range(0, len(keys), 500):
+            client.delete(*keys[start:start + 500])
+        if self.approach == 'fcall':
+            try:
+                client.function_delete(self.function_library)
+            except Exception as e:
+                # Setup may have failed before the library was loaded
+                logger.debug(f"Could not delete function library {self.function_library}: {e}")
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "approach": self.approach,
+            "keys": self.keys,
+            "ttl": self.ttl,
+            "round_trips": 3 if self.approach == 'commands' else 1
+        }
+
+
+WORKLOADS[IncrTtlWorkload.name] = IncrTtlWorkload
+
+
+class ScriptingBenchmark:
+    """Runs the same logical operation with every approach and compares them"""
+
+    def __init__(self, client=None):
+        self.client = client or redis_client.get_client()
+
+    def run(self, approaches=None, operations=1000, threads=1, keys=100, ttl=60):
+        """Run each approach in turn and report throughput and latency side by side"""
+        approaches = approaches or list(APPROACHES)
+        start_time = time.time()
+
+        results = {}
+        for approach in approaches:
+            workload = IncrTtlWorkload(approach=approach, keys=keys, ttl=ttl)
+            results[approach] = run_benchmark(self.client, workload, operations=operations, threads=threads)
+
+        baseline = results.get('commands', {}).get('ops_per_second') or 0.0
+        comparison = []
+        for approach in approaches:
+            result = results[approach]
+            latency = result.get("latency", {})
+            ops_per_second = result.get("ops_per_second", 0.0)
+            comparison.append({
+                "approach": approach,
+                "status": result.get("status"),
+                "ops_per_second": ops_per_second,
+                "p50_ms": latency.get("p50_ms"),
+                "p95_ms": latency.get("p95_ms"),
+                "p99_ms": latency.get("p99_ms"),
+                "speedup_vs_commands": round(ops_per_second / baseline, 2) if baseline and ops_per_second else None,
+                "error": result.get("error")
+            })
+
+        failed = [row["approach"] for row in comparison if row["status"] != "pass"]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "fail" if failed else "success",
+            "operation": "INCR + EXPIRE + TTL",
+            "operations_per_approach": operations,
+            "threads": threads,
+            "failed_approaches": failed,
+            "comparison": comparison,
+            "results": results,
+            "total_duration_ms": round((time.time() - start_time) * 1000, 2)
+        }
+
+
+# Global scripting benchmark instance
+scripting_benchmark = ScriptingBenchmark()
@@ -2,6 +2,9 @@
 Utility modules for Redis Testing App
 """
 from .redis_client import redis_client, RedisClient
-from .logger import setup_logging
+from .logger import setup_logging, route_sampler, get_logging_stats
+from .histogram import LatencyHistogram
+from .targets import target_registry, TargetRegistry, RedisTarget
 
-__all__ = ['redis_client', 'RedisClient', 'setup_logging']
+__all__ = ['redis_client', 'RedisClient', 'setup_logging', 'route_sampler', 'get_logging_stats',
+           'LatencyHistogram', 'target_registry', 'TargetRegistry', 'RedisTarget']
@@ -0,0 +1,105 @@
+"""
+Latency Histogram
+Log-linear bucketed latency histogram that can be merged across threads, targets and workers
+"""
+import math
+
+# Sub-buckets per power of two; 16 keeps relative error around 4%
+SUB_BUCKETS = 16
+# Smallest tracked value in microseconds
+MIN_US = 1
+
+
+class LatencyHistogram:
+    """Fixed-precision latency histogram with O(1) record and lossless merge"""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @staticmethod
+    def _bucket(value_us):
+        if value_us <= MIN_US:
+            return 0
+        exponent = int(math.log2(value_us))
+        fraction = value_us / (1 << exponent) - 1.0
+        return exponent * SUB_BUCKETS + int(fraction * SUB_BUCKETS)
+
+    @staticmethod
+    def _bucket_value(bucket):
+        exponent, sub = divmod(bucket, SUB_BUCKETS)
+        # Midpoint of the bucket range
+        return (1 << exponent) * (1.0 + (sub + 0.5) / SUB_BUCKETS)
+
+    def record(self, duration_ms):
+        """Record one latency sample given in milliseconds"""
+        value_us = max(int(duration_ms * 1000), 0)
+        bucket = self._bucket(value_us)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other):
+        """Merge another histogram into this one"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, pct):
+        """Get latency in milliseconds at the given percentile (0-100)"""
+        if self.count == 0:
+            return 0.0
+        threshold = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= threshold:
+                value_us = min(self._bucket_value(bucket), self.max_us)
+                return max(value_us, self.min_us or 0) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self):
+        """Get a JSON-friendly summary in milliseconds"""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_us / self.count / 1000.0, 3) if self.count else 0.0,
+            "min_ms": round((self.min_us or 0) / 1000.0, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "p999_ms": round(self.percentile(99.9), 3),
+            "max_ms": round(self.max_us / 1000.0, 3)
+        }
+
+    def to_dict(self):
+        """Serialize to a dict suitable for JSON transport"""
+        return {
+            "counts": {str(bucket): count for bucket, count in self.counts.items()},
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize a histogram produced by to_dict"""
+        histogram = cls()
+        histogram.counts = {int(bucket): count for bucket, count in data.get("counts", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total_us = data.get("total_us", 0)
+        histogram.min_us = data.get("min_us")
+        histogram.max_us = data.get("max_us", 0)
+        return histogram
@@ -1,32 +1,202 @@
 """
 Logging utilities
+Queue-backed, non-blocking log pipeline with per-route sampling and rate limiting
 """
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
+import time
 from config import Config
 
+# Structured fields appended to a log line when present on the record
+STRUCTURED_FIELDS = ('route', 'method', 'status_code', 'duration_ms', 'redis_ms', 'redis_calls')
+
+_listener = None
+_queue_handler = None
+_redis_timing = threading.local()
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formatter that appends structured key=value fields passed via `extra`"""
+
+    def format(self, record):
+        message = super().format(record)
+        fields = [f"{name}={getattr(record, name)}" for name in STRUCTURED_FIELDS
+                  if hasattr(record, name)]
+        if fields:
+            message = f"{message} | {' '.join(fields)}"
+        return message
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimiter:
+    """Token bucket limiting how many records per second pass through"""
+
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst or max(rate_per_sec, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.suppressed = 0
+
+    def allow(self):
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.suppressed += 1
+            return False
+
+
+class RouteLogSampler:
+    """Decides whether a request log line for a route should be emitted"""
+
+    def __init__(self, sample_rates=None, default_rate=1.0, rate_limit_per_sec=0):
+        self.sample_rates = sample_rates or {}
+        self.default_rate = default_rate
+        self.rate_limit_per_sec = rate_limit_per_sec
+        # One token bucket per route, so a chatty route cannot silence the others
+        self.limiters = {}
+        self.lock = threading.Lock()
+        self.sampled_out = 0
+
+    def _limiter(self, route):
+        limiter = self.limiters.get(route)
+        if limiter is None:
+            with self.lock:
+                limiter = self.limiters.setdefault(route, RateLimiter(self.rate_limit_per_sec))
+        return limiter
+
+    def rate_limited(self):
+        """Total lines suppressed by the per-route rate limits"""
+        return sum(limiter.suppressed for limiter in list(self.limiters.values()))
+
+    def should_log(self, route, status_code=200):
+        # Always keep errors regardless of sampling
+        if status_code >= 500:
+            return True
+        rate = self.sample_rates.get(route, self.default_rate)
+        if rate < 1.0 and random.random() >= rate:
+            self.sampled_out += 1
+            return False
+        return self._limiter(route).allow()
+
+
+def parse_sample_rates(value):
+    """Parse 'route=rate,route=rate' into a dict"""
+    rates = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        route, rate = item.rsplit('=', 1)
+        try:
+            rates[route.strip()] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+route_sampler = RouteLogSampler(
+    sample_rates=parse_sample_rates(Config.LOG_SAMPLE_RATES),
+    default_rate=Config.LOG_DEFAULT_SAMPLE_RATE,
+    rate_limit_per_sec=Config.LOG_RATE_LIMIT_PER_SEC
+)
+
+
+def reset_redis_timing():
+    """Reset the per-thread Redis time accumulator (call at request start)"""
+    _redis_timing.total_ms = 0.0
+    _redis_timing.calls = 0
+
+
+def add_redis_time(duration_ms):
+    """Add time spent in a Redis round trip to the current thread's accumulator"""
+    _redis_timing.total_ms = getattr(_redis_timing, 'total_ms', 0.0) + duration_ms
+    _redis_timing.calls = getattr(_redis_timing, 'calls', 0) + 1
+
+
+def get_redis_timing():
+    """Get (total_ms, calls) accumulated on the current thread"""
+    return getattr(_redis_timing, 'total_ms', 0.0), getattr(_redis_timing, 'calls', 0)
+
+
+def get_logging_stats():
+    """Get counters describing the log pipeline"""
+    return {
+        "async": _listener is not None,
+        "queue_size": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": route_sampler.sampled_out,
+        "rate_limited": route_sampler.rate_limited()
+    }
+
+
+def stop_logging():
+    """Flush pending records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging():
     """Configure application logging"""
+    global _listener, _queue_handler
     log_level = getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO)
-    
+
     # Create formatter
-    formatter = logging.Formatter(
+    formatter = StructuredFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    
+
     # Root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(console_handler)
-    
+
+    if Config.LOG_ASYNC and _listener is None:
+        # Request threads only enqueue; a background thread does the stdout writes
+        log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        _queue_handler.setLevel(log_level)
+        _listener = logging.handlers.QueueListener(
+            log_queue, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+        root_logger.addHandler(_queue_handler)
+    elif not Config.LOG_ASYNC:
+        root_logger.addHandler(console_handler)
+
     # Suppress noisy loggers
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
-    
+
     return root_logger
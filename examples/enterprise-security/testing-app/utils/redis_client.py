@@ -4,18 +4,61 @@ Manages Redis connections with Microsoft Entra ID authentication support
 """
 import redis
 import logging
+import time
+from redis.client import Pipeline
+from redis.cluster import RedisCluster
 from config import Config
+from utils.logger import add_redis_time
 
 logger = logging.getLogger(__name__)
 
 
+def _timed(method):
+    """Wrap a client method so its duration is added to the request's Redis time"""
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            add_redis_time((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+class TimedPipeline(Pipeline):
+    """Pipeline that records one Redis call per execute() round trip"""
+    
+    execute = _timed(Pipeline.execute)
+
+
+class TimedRedis(redis.Redis):
+    """Redis client that records time spent in each command for request logging"""
+    
+    execute_command = _timed(redis.Redis.execute_command)
+    
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class TimedRedisCluster(RedisCluster):
+    """Cluster client that records time spent in each command (pipelines are not timed)"""
+    
+    execute_command = _timed(RedisCluster.execute_command)
+
+
 class RedisClient:
     """Redis connection manager with Entra ID authentication support"""
     
-    def __init__(self):
+    def __init__(self, config=None, use_entra_id=None, cluster=False):
         self.client = None
-        self.config = Config.get_redis_config()
-        self.use_entra_id = Config.REDIS_USE_ENTRA_ID
+        self.config = config or Config.get_redis_config()
+        self.use_entra_id = Config.REDIS_USE_ENTRA_ID if use_entra_id is None else use_entra_id
+        # OSS cluster policy endpoints need a cluster-aware client
+        self.cluster = cluster
+        
+    def _client_class(self):
+        if self.cluster:
+            return TimedRedisCluster
+        return TimedRedis
         
     def connect(self):
         """
@@ -49,7 +92,7 @@ class RedisClient:
                 logger.info(f"Connecting to Redis at {self.config['host']}:{self.config['port']} with TLS")
                 
                 # Connect to Azure Managed Redis with Entra ID
-                self.client = redis.Redis(
+                self.client = self._client_class()(
                     host=self.config['host'],
                     port=self.config['port'],
                     credential_provider=credential_provider,
@@ -63,7 +106,7 @@ class RedisClient:
                 logger.info("Redis client created with Entra ID authentication")
             else:
                 logger.info("Connecting to Redis using password authentication")
-                self.client = redis.Redis(**self.config)
+                self.client = self._client_class()(**self.config)
             
             # Test connection
             self.client.ping()
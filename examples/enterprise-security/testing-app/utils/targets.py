@@ -0,0 +1,161 @@
+"""
+Target Registry
+Named Redis endpoints (deployments/SKUs) that benchmarks can run against side by side
+"""
+import json
+import logging
+from config import Config
+from utils.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+AUTH_MODES = ('entra_id', 'password')
+
+
+class RedisTarget:
+    """A named Redis endpoint with its own auth, TLS and cluster settings"""
+
+    def __init__(self, name, host, port=10000, auth_mode='entra_id', password='',
+                 ssl=True, cluster=False, sku='', hourly_cost_usd=0.0, tags=None):
+        if auth_mode not in AUTH_MODES:
+            raise ValueError(f"Unknown auth_mode '{auth_mode}' for target '{name}', expected one of {AUTH_MODES}")
+        if auth_mode == 'entra_id' and not ssl:
+            # The Entra ID connection path always uses TLS, as Azure Managed Redis requires
+            raise ValueError(f"Target '{name}' uses entra_id, which requires ssl: true")
+        self.name = name
+        self.host = host
+        self.port = int(port)
+        self.auth_mode = auth_mode
+        self.password = password
+        self.ssl = ssl
+        self.cluster = cluster
+        self.sku = sku
+        self.hourly_cost_usd = float(hourly_cost_usd or 0.0)
+        self.tags = tags or {}
+        self._client = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a target from a registry entry"""
+        return cls(
+            name=data['name'],
+            host=data['host'],
+            port=data.get('port', 10000),
+            auth_mode=data.get('auth_mode', 'entra_id'),
+            password=data.get('password', ''),
+            ssl=data.get('ssl', True),
+            cluster=data.get('cluster', False),
+            sku=data.get('sku', ''),
+            hourly_cost_usd=data.get('hourly_cost_usd', 0.0),
+            tags=data.get('tags')
+        )
+
+    def get_redis_config(self):
+        """Get Redis connection configuration in the shape of Config.get_redis_config"""
+        config = Config.get_redis_config()
+        config.update({
+            'host': self.host,
+            'port': self.port,
+            'password': self.password,
+            'ssl': self.ssl
+        })
+        return config
+
+    def get_client(self):
+        """Get a connected Redis client for this target, or None"""
+        if self._client is None:
+            self._client = RedisClient(
+                config=self.get_redis_config(),
+                use_entra_id=self.auth_mode == 'entra_id',
+                cluster=self.cluster
+            )
+        return self._client.get_client()
+
+    def close(self):
+        """Close this target's connection"""
+        if self._client is not None:
+            self._client.close()
+
+    def to_dict(self):
+        """Describe the target without secrets"""
+        return {
+            "name": self.name,
+            "host": self.host,
+            "port": self.port,
+            "auth_mode": self.auth_mode,
+            "ssl": self.ssl,
+            "cluster": self.cluster,
+            "sku": self.sku,
+            "hourly_cost_usd": self.hourly_cost_usd,
+            "tags": self.tags
+        }
+
+
+class TargetRegistry:
+    """Holds the named targets available to benchmarks"""
+
+    def __init__(self):
+        self.targets = {}
+
+    def add(self, target):
+        """Register a target, replacing any existing target with the same name"""
+        self.targets[target.name] = target
+        return target
+
+    def get(self, name):
+        """Get a target by name"""
+        if name not in self.targets:
+            raise KeyError(f"Unknown target: {name}")
+        return self.targets[name]
+
+    def select(self, names=None):
+        """Get targets by name, or all targets if no names are given"""
+        if not names:
+            return list(self.targets.values())
+        return [self.get(name) for name in names]
+
+    def names(self):
+        return list(self.targets)
+
+    def to_list(self):
+        return [target.to_dict() for target in self.targets.values()]
+
+    def load(self, entries):
+        """Register targets from a list of dicts"""
+        for entry in entries:
+            self.add(RedisTarget.from_dict(entry))
+
+    @classmethod
+    def from_config(cls):
+        """
+        Build the registry from REDIS_TARGETS_FILE or REDIS_TARGETS (JSON list).
+        Falls back to a single 'default' target built from the REDIS_* settings.
+        """
+        registry = cls()
+        try:
+            if Config.REDIS_TARGETS_FILE:
+                with open(Config.REDIS_TARGETS_FILE) as f:
+                    registry.load(json.load(f))
+            elif Config.REDIS_TARGETS:
+                registry.load(json.loads(Config.REDIS_TARGETS))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Failed to load Redis targets: {e}")
+
+        if not registry.targets:
+            registry.add(RedisTarget(
+                name='default',
+                host=Config.REDIS_HOSTNAME,
+                port=Config.REDIS_PORT,
+                auth_mode='entra_id' if Config.REDIS_USE_ENTRA_ID else 'password',
+                password=Config.REDIS_PASSWORD,
+                # Mirrors RedisClient, which always uses TLS with Entra ID
+                ssl=Config.REDIS_SSL or Config.REDIS_USE_ENTRA_ID,
+                sku=Config.REDIS_SKU,
+                hourly_cost_usd=Config.REDIS_HOURLY_COST_USD
+            ))
+        logger.info(f"Loaded {len(registry.targets)} Redis target(s): {', '.join(registry.names())}")
+        return registry
+
+
+# Global target registry
+target_registry = TargetRegistry.from_config()